@@ -10,9 +10,13 @@ board
 
 class eightBlock():
 
+    # Every move can be undone by moving the same tile back the other way
+    reverse_dirs = {"left": "right", "right": "left", "up": "down", "down": "up"}
+
     def __init__(self, start_state = None, goal_state = None):
         '''Declares the valid tile values, row and column indices, and 
-        movement directions applicable to any board. Then uses the optional 
+        movement directions applicable to any board, along with the table of
+        moves from each square (see get_move_table). Then uses the optional 
         arguments start_state and goal_state to declare the initial positions 
         of the puzzle (`board_state`) and the `goal_state` we're aiming for, 
         respectively.
@@ -24,6 +28,7 @@ class eightBlock():
         self.valid_vals = [i for i in range(9)]
         self.valid_dims = [i for i in range(3)]
         self.valid_dirs = ["left","right","up","down"]
+        self.move_table = self.get_move_table()
         if start_state:
             self.board_state = self.validate(start_state)
         else:
@@ -37,6 +42,10 @@ class eightBlock():
         '''Running this with the argument `start` returns a shuffling of 0-8 as
         the initial board configuration. Otherwise, this method returns the 
         default goal configuration of [1,2,3,4,5,6,7,8,0]
+
+        Note that about half of these shuffles won't be solveable. For 
+        boards that are guaranteed solveable at a known difficulty, see 
+        instanceGenerator in instance_generator.py
         '''
         if default_type == "start":
             dflt_board = self.valid_vals.copy()
@@ -57,6 +66,26 @@ class eightBlock():
             raise ValueError("Board must be a permutation of integers 0-8")
         return given_board
          
+    def is_solveable(self, board = None, goal = None):
+        '''Only half of the permutations of 0-8 can actually reach a given
+        goal. Every move either swaps the blank along a row, which doesn't 
+        change the order of the other tiles, or along a column, which jumps 
+        one tile over two others. Either way the number of inversions 
+        (pairs of non-zero tiles that are out of order) keeps its parity, 
+        so a board is solveable only if its inversion count has the same 
+        parity as the goal's. If not explicitly given a goal, we compare 
+        against self.goal_state.
+        '''
+        if board is None:
+            board = self.board_state
+        if goal is None:
+            goal = self.goal_state
+        def count_inversions(b):
+            tiles = [v for v in b if v != 0]
+            return sum(1 for i, v in enumerate(tiles) for w in tiles[i + 1:] if v > w)
+        board_parity = count_inversions(self.validate(board)) % 2
+        return board_parity == count_inversions(self.validate(goal)) % 2
+
     def display_board(self, board = None):
         '''Will display a given board configuration in 3 X 3 form.
 
@@ -87,8 +116,8 @@ class eightBlock():
         misplaced = []
         if board is None:
             board = self.board_state
-        for i, v in enumerate(self.validate(board)):
-            if self.validate(board)[i] != self.goal_state[i] and v!= 0:
+        for v, goal_v in zip(self.validate(board), self.goal_state):
+            if v != goal_v and v != 0:
                 misplaced.append(v)
         return misplaced
 
@@ -147,6 +176,42 @@ class eightBlock():
                 next_boards_dict[mv_dir] = self.make_move(mv_dir)
         return next_boards_dict
 
+    def get_move_table(self):
+        '''For each index the zero could be at, lists the (direction, index)
+        pairs it can swap with, in the same order as valid_dirs. Moving a tile
+        "left" into the blank means swapping the zero with the index to its 
+        right, and so on. 
+
+        The search loops use this table to move the zero around directly, 
+        which is a lot faster than calling make_move for every direction.
+        '''
+        move_table = []
+        for z_ind in range(9):
+            r, c = divmod(z_ind, 3)
+            moves = []
+            if c < 2: moves.append(("left", z_ind + 1))
+            if c > 0: moves.append(("right", z_ind - 1))
+            if r < 2: moves.append(("up", z_ind + 3))
+            if r > 0: moves.append(("down", z_ind - 3))
+            move_table.append(moves)
+        return move_table
+
+    def swap_state(self, state, z_ind, swap_ind):
+        '''Returns the state string you get by swapping the characters at
+        z_ind and swap_ind, which is all a move does to a state string
+        '''
+        lo, hi = min(z_ind, swap_ind), max(z_ind, swap_ind)
+        return state[:lo] + state[hi] + state[lo + 1:hi] + state[lo] + state[hi + 1:]
+
+    def get_neighbor_states(self, state):
+        '''Returns a (direction, child_state) tuple for every valid move from
+        a state string, working on the strings directly rather than going 
+        through make_move
+        '''
+        z_ind = state.index("0")
+        return [(mv_dir, self.swap_state(state, z_ind, swap_ind))
+                for mv_dir, swap_ind in self.move_table[z_ind]]
+
     def board_to_state(self, board_list):
         '''The list form of a board configuration will be helpful for making
         moves and calculating distances. In terms of repeated state checking, 
@@ -1,4 +1,7 @@
+import time
+
 from base_board import eightBlock
+from search_engine import searchEngine, searchFrontier
 
 '''This file contains methods that all solvers will share. Every single 
 solver algorithm, whether it uses heuristics or not, will in some way make 
@@ -6,20 +9,26 @@ use of steps like maintaining a list of next possible states, repeated state
 checking, and tracking the pathways we've taken through the puzzle.
 
 Basically, any of the actual solvers will inherit from this class and
-add some methods (namely an actual solve() method) that builds on or extends 
-the ones defined here.
+pick a frontier strategy (in make_frontier) that the shared solve() method
+hands to the search loop in search_engine.py.
 '''
 
 class eightBlockSolver(eightBlock):
 
+    # Any extra attributes a solver needs to pick a search back up where it
+    # left off. Subclasses extend this list and save_checkpoint stores them.
+    checkpoint_attrs = []
+
     def __init__(self, start_state = None, goal_state = None):
-        '''Initializes an eightBlock and then defines two additional
+        '''Initializes an eightBlock and then defines the additional
         class attributes needed to reach and keep track of solution
         paths
 
             * path_map (dict): a dictionary that keeps track of child:parent 
             relationships visited by the solve() method. Initializes as
             empty
+            * path_costs (dict): the cost of the path that got us to each 
+            state in path_map
             * children_list: the data structure used to implement
             any search. The first thing on this list is a dictionary 
             representation of the initial board configuration, along with
@@ -27,27 +36,235 @@ class eightBlockSolver(eightBlock):
             search proceeds, we'll add more of these dictionaries that track
             what the board configuration is, what parent state we came from, 
             what direction we moved in, and the depth in the search tree.
+            Once solve() starts, this list is swapped for the frontier 
+            returned by make_frontier
+            * checkpoint_path: where to save the search state if the solver
+            runs out of time or gets interrupted. None means we don't save
+            * checkpoint_signals: the signals that make solve() stop and
+            save a checkpoint. None means SIGTERM
+            * interrupted: set to the signal number by handle_interrupt,
+            and False otherwise
         '''
         super().__init__(start_state, goal_state)
         self.path_map = {}
+        self.path_costs = {}
         self.children_list = [{"child":self.board_state,
+                               "state":self.board_to_state(self.board_state),
                                "parent":None,
                                "path_cost":0}]
+        self.checkpoint_path = None
+        self.checkpoint_signals = None
+        self.interrupted = False
 
-    def check_next_child(self):
-        '''We begin any solve method by looking at the first child board 
-        dictionary available. There are cases (non-solveable boards) 
-        where this list will run out and be empty.
+    def make_frontier(self):
+        '''This method will be implemented in child classes. It returns an
+        empty frontier from search_engine.py, and which frontier you pick is 
+        the main thing separating one search algorithm from another
+        '''
+        raise NotImplementedError
 
-        This method returns the first object in self.children_list if it 
-        exists, and returns None otherwise.
+    def load_frontier(self, nodes):
+        '''Replaces children_list with a fresh frontier holding nodes'''
+        self.children_list = self.make_frontier()
+        self.children_list.extend(nodes)
+        return self.children_list
+
+    def restart_search(self, verbose = False):
+        '''Called when the frontier runs out. Solvers that can restart the 
+        search with looser limits do so here and return True. By default, an
+        empty frontier means the board can't be solved, so we return False.
         '''
+        return False
+
+    def solve(self, verbose = False, time_bound = 180, check_every = 100, 
+              max_expansions = None):
+        '''Runs the search loop in search_engine.py over this solver's 
+        frontier until it finds the goal, returning the solution path. 
+        Returns None if the board can't be solved or the search stops early.
+
+        The time_bound argument will end any solver that has been running for
+        more than X seconds. Default value lets these spin for 3 minutes max.
+        Along with interrupts and the optional max_expansions budget, the 
+        time is only checked once every check_every boards.
+        '''
+        if not isinstance(self.children_list, searchFrontier):
+            self.load_frontier(self.children_list)
+        engine = searchEngine(self, check_every, max_expansions)
+        previous_handlers = self.install_signal_handlers()
         try:
-            next_child = self.children_list[0]
-        except IndexError:
-            print("Initial board state not solveable")
-            next_child = None
-        return next_child
+            missed = engine.run(verbose = verbose, time_bound = time_bound)
+        finally:
+            self.restore_signal_handlers(previous_handlers)
+        if missed:
+            return None
+        print("Solution found!")
+        return self.retrieve_solution_path()
+
+    def enable_checkpointing(self, checkpoint_path, signals = None):
+        '''Tells the solver to save its search state to checkpoint_path 
+        whenever solve() stops early, either by hitting its time_bound or by
+        receiving one of the given signals. If no signals are given, we 
+        listen for SIGTERM. Nothing is installed until solve() runs; see 
+        install_signal_handlers.
+        '''
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_signals = signals
+
+    def install_signal_handlers(self):
+        '''Called at the start of solve(). If checkpointing is on, points 
+        checkpoint_signals at handle_interrupt and returns a dictionary of 
+        the handlers they replaced, for restore_signal_handlers to put back 
+        once solve() returns. The handler only sets a flag, so the state is 
+        always saved between two iterations of the search loop, never in the
+        middle of one.
+
+        Python only lets the main thread install signal handlers, so in any 
+        other thread (a worker pool, say) we skip them and only checkpoint 
+        on time_bound. signal (like json and gzip below) is imported here 
+        rather than at the top of the file, so that importing a solver stays
+        cheap.
+        '''
+        if self.checkpoint_path is None:
+            return {}
+        import signal, threading
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+        signals = self.checkpoint_signals
+        if signals is None:
+            signals = (signal.SIGTERM,)
+        return {sig: signal.signal(sig, self.handle_interrupt) for sig in signals}
+
+    def restore_signal_handlers(self, previous_handlers):
+        '''Puts back the handlers install_signal_handlers replaced. If a 
+        signal came in too late for the search loop to act on it, we raise 
+        it again so that the old handler still gets to deal with it.
+        '''
+        if not previous_handlers:
+            return
+        import signal
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, signal.SIG_DFL if handler is None else handler)
+        if self.interrupted:
+            signum, self.interrupted = self.interrupted, False
+            signal.raise_signal(signum)
+
+    def handle_interrupt(self, signum, frame):
+        '''Signal handler installed by install_signal_handlers'''
+        self.interrupted = signum
+
+    def out_of_time(self, runtime, time_bound):
+        '''Checked by the search loop once every check_every boards (and 
+        once per layer by beam search). Returns True if the solver has been 
+        running for more than time_bound seconds or has been
+        interrupted, saving a checkpoint first if checkpoint_path is set.
+        Returns False otherwise.
+        '''
+        if not self.interrupted and runtime < time_bound:
+            return False
+        if self.interrupted:
+            self.stop_early("Interrupted after {:.2f} seconds".format(runtime))
+        else:
+            self.stop_early("Running for {} over seconds".format(time_bound))
+        return True
+
+    def stop_early(self, reason):
+        '''Reports why the search is stopping before it found a solution, 
+        saving a checkpoint first if checkpoint_path is set
+        '''
+        if self.checkpoint_path is None:
+            err_pt_2 = "assuming unsolveable board."
+        else:
+            self.save_checkpoint()
+            err_pt_2 = "saved search to {}.".format(self.checkpoint_path)
+        print("...".join([reason, err_pt_2]))
+        self.interrupted = False
+
+    def start_limits(self, time_bound, check_every, max_expansions):
+        '''Solvers with their own loop instead of the one in 
+        search_engine.py (beam search, the external-memory search) call this
+        before they start, so that over_limits knows what to check against
+        '''
+        self.search_start = time.time()
+        self.time_bound = time_bound
+        self.check_every = check_every
+        self.max_expansions = max_expansions
+        self.expansions = 0
+
+    def over_limits(self, ticks = None):
+        '''Called by those loops every time they handle a board. Once every
+        check_every boards, this looks at the clock, interrupts, and the 
+        max_expansions budget, returning True (after stop_early has 
+        reported why) if the search should stop. Returns False otherwise.
+
+        Boards are counted by self.expansions, unless the loop is doing 
+        something other than expanding boards (like merging files) and 
+        passes its own count as ticks.
+        '''
+        if ticks is None:
+            ticks = self.expansions
+        if ticks % self.check_every:
+            return False
+        if self.out_of_time(time.time() - self.search_start, self.time_bound):
+            return True
+        if self.max_expansions is not None and self.expansions >= self.max_expansions:
+            self.stop_early("Expanded {} states".format(self.expansions))
+            return True
+        return False
+
+    def save_checkpoint(self, checkpoint_path = None):
+        '''Writes everything needed to continue the search to a gzipped 
+        JSON file: the current board, the frontier in children_list, the 
+        path_map (which doubles as the closed set), and any solver specific 
+        attributes in checkpoint_attrs, like the IDDFS depth_limit. The 
+        g-values are the path_cost entries on each frontier board.
+
+        Boards are stored in their string form to keep the file small.
+        '''
+        import gzip, json
+        if checkpoint_path is None:
+            checkpoint_path = self.checkpoint_path
+        frontier = []
+        for child in self.children_list:
+            child = dict(child)
+            child["child"] = child.pop("state")
+            frontier.append(child)
+        checkpoint = {"solver": type(self).__name__,
+                      "heuristic": getattr(self, "heuristic", None),
+                      "board_state": self.board_to_state(self.board_state),
+                      "goal_state": self.board_to_state(self.goal_state),
+                      "children_list": frontier,
+                      "path_map": self.path_map,
+                      "path_costs": self.path_costs,
+                      "attrs": {a: getattr(self, a) for a in self.checkpoint_attrs}}
+        with gzip.open(checkpoint_path, "wt") as f:
+            json.dump(checkpoint, f, separators = (",", ":"))
+
+    def load_checkpoint(self, checkpoint_path):
+        '''Restores a search saved by save_checkpoint, so that the next call
+        to solve() picks up where the old one stopped. The checkpoint has to
+        come from the same kind of solver (and heuristic, if it has one).
+        '''
+        import gzip, json
+        with gzip.open(checkpoint_path, "rt") as f:
+            checkpoint = json.load(f)
+        saved_as = (checkpoint["solver"], checkpoint["heuristic"])
+        loading_as = (type(self).__name__, getattr(self, "heuristic", None))
+        if saved_as != loading_as:
+            e_msg = "Checkpoint was saved by {}, cannot load into {}"
+            raise ValueError(e_msg.format(saved_as, loading_as))
+        self.board_state = self.validate(self.state_to_board(checkpoint["board_state"]))
+        self.goal_state = self.validate(self.state_to_board(checkpoint["goal_state"]))
+        self.path_map = {k: tuple(v) if v else v
+                         for k, v in checkpoint["path_map"].items()}
+        self.path_costs = checkpoint["path_costs"]
+        for attr, val in checkpoint["attrs"].items():
+            setattr(self, attr, val)
+        frontier = []
+        for child in checkpoint["children_list"]:
+            child["state"] = child["child"]
+            child["child"] = self.state_to_board(child["state"])
+            frontier.append(child)
+        self.load_frontier(frontier)
 
     def update_path_map(self, current_board):
         '''Once we have a board from children_list, we need to update 
@@ -62,9 +279,13 @@ class eightBlockSolver(eightBlock):
 
         The only exception to this dictionary structure is that the initial 
         state key will have a value of None, since it has no parent.
+
+        The search loop in search_engine.py does this inline, so this is 
+        only used by solvers with their own loop, like beam search.
         '''
         self.board_state = current_board["child"]
-        current_state = self.board_to_state(self.board_state)
+        current_state = current_board["state"]
+        self.path_costs[current_state] = current_board["path_cost"]
         parent_state = current_board["parent"]
         if parent_state is None:
             self.path_map[current_state] = parent_state
@@ -79,18 +300,30 @@ class eightBlockSolver(eightBlock):
         the direction of the move to yield the child, and the new level in the 
         search tree.
 
+        Rather than going through make_move, we swap the zero using the 
+        precomputed move_table, building the child's list and string forms 
+        side by side.
+
         Returns a list of board dictionaries that needs to be integrated into
         children_list. 
         '''
         child_board_dicts = []
-        poss_kids = self.get_next_boards()
-        for poss_mv in poss_kids.keys():
-            if self.board_to_state(poss_kids[poss_mv]) in self.path_map.keys():
+        board = current_board["child"]
+        state = current_board["state"]
+        path_cost = current_board["path_cost"] + 1
+        z_ind = board.index(0)
+        for poss_mv, swap_ind in self.move_table[z_ind]:
+            child_state = self.swap_state(state, z_ind, swap_ind)
+            if child_state in self.path_map:
                 continue
-            child_board = {"child":poss_kids[poss_mv],
-                           "parent":self.board_to_state(self.board_state),
+            child = board.copy()
+            child[z_ind] = child[swap_ind]
+            child[swap_ind] = 0
+            child_board = {"child":child,
+                           "state":child_state,
+                           "parent":state,
                            "mv_dir":poss_mv,
-                           "path_cost":current_board["path_cost"] + 1}
+                           "path_cost":path_cost}
             child_board_dicts.append(child_board)
         return child_board_dicts
 
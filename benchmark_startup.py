@@ -0,0 +1,33 @@
+import statistics
+import subprocess
+import sys
+
+'''Measures how long a fresh python process takes to import the library, 
+since a process-per-request setup pays that cost on every spawn. Each import
+runs in its own interpreter so nothing is cached between runs. The clock 
+starts inside that interpreter, just before the import, so the cost of 
+starting python itself is never counted. We report the median over several 
+runs.
+'''
+
+IMPORTS = {"solver_registry": "import solver_registry",
+           "one solver": "import solver_registry; solver_registry.get_solver_class('bfs')",
+           "all solvers": "import non_heuristic, heuristic"}
+
+
+def time_import(statement, runs = 10):
+    '''Returns the median wall time, in seconds, of running `statement` in 
+    a brand new interpreter
+    '''
+    timer = "import time; t0 = time.perf_counter(); {}; print(time.perf_counter() - t0)"
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", timer.format(statement)], 
+                             capture_output = True, text = True, check = True)
+        timings.append(float(out.stdout))
+    return statistics.median(timings)
+
+if __name__ == "__main__":
+    for label, statement in IMPORTS.items():
+        t = time_import(statement)
+        print("{:>16}: {:.2f} ms".format(label, 1000 * t))
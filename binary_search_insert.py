@@ -3,7 +3,8 @@ import unittest
 '''
 More of an experimental script to prototype and test how 
 binary-search-tree insertion into an ordered list would work.
-This method is repurposed for all of the heuristic solvers in `heuristic.py`
+This method was repurposed for the heuristic solvers in `heuristic.py`, 
+which have since moved to the heap-based priorityFrontier in `search_engine.py`
 '''
 
 def binary_insert(value, array, lwr = None, upr = None):
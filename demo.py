@@ -1,10 +1,10 @@
 import random
-import ipdb
 import time
 
 from non_heuristic import depthFirstSearchSolver, breadthFirstSearchSolver, \
 iterativeDeepeningSolver
-from heuristic import bestFirstSearchSolver, aStarSearchSolver
+from heuristic import bestFirstSearchSolver, aStarSearchSolver, \
+beamSearchSolver
 
 
 if __name__ == "__main__":
@@ -52,8 +52,10 @@ if __name__ == "__main__":
             case_dict[k]["goal"])
         ASTAR_ec = aStarSearchSolver("euclidean", case_dict[k]["start"], \
             case_dict[k]["goal"])
+        BEAM_mn = beamSearchSolver("manhattan", case_dict[k]["start"], \
+            case_dict[k]["goal"], beam_width = 50, restarts = 2)
         solvers = [DFS, BFS, IDS, GREEDY_hm, GREEDY_mn, GREEDY_ec, \
-        ASTAR_hm, ASTAR_mn, ASTAR_ec]
+        ASTAR_hm, ASTAR_mn, ASTAR_ec, BEAM_mn]
         
         #3. Display, index, and goal-state check
         foo = random.choice(solvers)
@@ -84,7 +86,11 @@ if __name__ == "__main__":
             print("Solution cost for {}: {}".format(nm, cst))
             print("---"*15,"\n")
 
-        ipdb.set_trace()
+        try:
+            import ipdb as debugger
+        except ImportError:
+            import pdb as debugger
+        debugger.set_trace()
 
 
 
@@ -0,0 +1,294 @@
+import bisect
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+from base_solver import eightBlockSolver
+
+'''This file contains a breadth-first search that keeps its frontier and
+visited set on disk instead of in path_map and children_list, so the amount
+of memory it needs doesn't grow with the size of the search.
+
+Every board is encoded as a single 64 bit integer: each tile fits in one hex
+digit, so the state string "123804765" is just read as the hex number
+0x123804765. Sorting those integers sorts the state strings too.
+
+Each layer of the search lives in its own file of sorted, unique integers.
+To build the next layer we:
+
+    * read the current layer front to back, writing out every child in
+    sorted runs of at most run_size boards
+    * merge those runs together, at most merge_fan_in at a time, dropping 
+    duplicates as we go, until few enough runs are left for one last pass
+    * on that last pass, also drop anything in the previous layer
+
+Since run_size bounds each run and merge_fan_in bounds how many runs are 
+open at once, both memory and open files stay bounded however big a layer 
+gets.
+
+Only the previous layer needs checking. A move always takes the blank from
+a light square to a dark one (like a chessboard) or back, so a board's
+children can't be in its own layer, and anything older than the previous
+layer is more than one move away. Together, the layer files make up the
+visited set, and all of this reading and writing is sequential.
+'''
+
+class searchStopped(Exception):
+    '''Raised partway through building a layer when the search runs out 
+    of time or budget, so that solve() can stop without finishing the layer
+    '''
+    pass
+
+class externalMemoryBFSSolver(eightBlockSolver):
+
+    def __init__(self, start_state = None, goal_state = None, work_dir = None,
+                 run_size = 100000, merge_fan_in = 16, keep_files = False):
+        '''On top of a regular solver, this sets up:
+
+            * work_dir: where the layer files go. If not given, we make a
+            temporary directory
+            * run_size: the most boards we hold in memory at once while
+            sorting children, which is what bounds memory use
+            * merge_fan_in: the most runs we merge (and so hold open) at once
+            * keep_files: leave the layer files on disk after solve() finishes.
+            Otherwise they're deleted
+            * layer_files: the path of every layer written so far, by depth
+        '''
+        super().__init__(start_state, goal_state)
+        self.work_dir = work_dir
+        self.run_size = run_size
+        if merge_fan_in < 2:
+            raise ValueError("merge_fan_in must be at least 2")
+        self.merge_fan_in = merge_fan_in
+        self.keep_files = keep_files
+        self.layer_files = []
+
+    def enable_checkpointing(self, checkpoint_path, signals = None):
+        '''The checkpoints in base_solver.py save children_list and 
+        path_map, and this solver keeps its search in layer files instead, 
+        so there'd be nothing useful in one. Use keep_files and work_dir if 
+        you want the layers to outlive solve().
+        '''
+        e_msg = "{} keeps its search on disk and doesn't support checkpoints"
+        raise NotImplementedError(e_msg.format(type(self).__name__))
+
+    def load_checkpoint(self, checkpoint_path):
+        '''See enable_checkpointing'''
+        self.enable_checkpointing(checkpoint_path)
+
+    def encode(self, state):
+        '''Packs a state string into an integer, one hex digit per tile'''
+        return int(state, 16)
+
+    def decode(self, code):
+        '''Simply the inverse of encode'''
+        return format(code, "09x")
+
+    def write_codes(self, path, codes):
+        '''Writes an iterable of encoded states to path, run_size at a time.
+        Returns how many we wrote.
+        '''
+        written = 0
+        buffer = array("Q")
+        with open(path, "wb") as f:
+            for code in codes:
+                buffer.append(code)
+                if len(buffer) >= self.run_size:
+                    buffer.tofile(f)
+                    written += len(buffer)
+                    buffer = array("Q")
+            buffer.tofile(f)
+            written += len(buffer)
+        return written
+
+    def read_codes(self, path):
+        '''Yields every encoded state in the file at path, in order, through
+        a memory map so that only the pages we're reading are in memory
+        '''
+        if not os.path.getsize(path):
+            return
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+                codes = memoryview(mm).cast("Q")
+                try:
+                    yield from codes
+                finally:
+                    codes.release()
+
+    def file_contains(self, path, code):
+        '''Binary search for code in a sorted layer file'''
+        if not os.path.getsize(path):
+            return False
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+                codes = memoryview(mm).cast("Q")
+                idx = bisect.bisect_left(codes, code)
+                found = idx < len(codes) and codes[idx] == code
+                codes.release()
+        return found
+
+    def write_sorted_runs(self, layer_path, depth):
+        '''Reads the layer at layer_path and writes all of its children out
+        in sorted, duplicate-free runs of at most run_size boards each.
+        Returns the list of run file paths.
+        '''
+        run_paths = []
+        run = set()
+        def flush():
+            run_path = os.path.join(self.work_dir, "run_{}_{}.bin".format(depth, len(run_paths)))
+            self.write_codes(run_path, sorted(run))
+            run_paths.append(run_path)
+            run.clear()
+        for code in self.read_codes(layer_path):
+            if self.over_limits():
+                raise searchStopped
+            for _, child in self.get_neighbor_states(self.decode(code)):
+                run.add(self.encode(child))
+            self.expansions += 1
+            if len(run) >= self.run_size:
+                flush()
+        if run:
+            flush()
+        return run_paths
+
+    def merge_unique(self, run_paths):
+        '''Merges sorted run files into one sorted stream without 
+        duplicates, checking the limits as we go
+        '''
+        last = None
+        for ticks, code in enumerate(heapq.merge(*[self.read_codes(p) for p in run_paths]), 1):
+            if self.over_limits(ticks):
+                raise searchStopped
+            if code != last:
+                last = code
+                yield code
+
+    def reduce_runs(self, run_paths, depth):
+        '''Merges runs merge_fan_in at a time into bigger runs, deleting 
+        the ones it's used up, until there are few enough left to merge in 
+        one go. Returns the paths of the runs that are left.
+        '''
+        merge_pass = 0
+        while len(run_paths) > self.merge_fan_in:
+            merged_paths = []
+            for i in range(0, len(run_paths), self.merge_fan_in):
+                group = run_paths[i:i + self.merge_fan_in]
+                merged_name = "run_{}_pass{}_{}.bin".format(depth, merge_pass, len(merged_paths))
+                merged_path = os.path.join(self.work_dir, merged_name)
+                self.write_codes(merged_path, self.merge_unique(group))
+                for run_path in group:
+                    os.remove(run_path)
+                merged_paths.append(merged_path)
+            run_paths = merged_paths
+            merge_pass += 1
+        return run_paths
+
+    def merge_runs(self, run_paths, previous_path):
+        '''The last merge pass: merges the remaining runs into one sorted 
+        stream, skipping duplicates and anything that's in the previous layer
+        '''
+        previous = self.read_codes(previous_path) if previous_path else iter(())
+        prev_code = next(previous, None)
+        for code in self.merge_unique(run_paths):
+            while prev_code is not None and prev_code < code:
+                prev_code = next(previous, None)
+            if code != prev_code:
+                yield code
+
+    def trace_back(self, goal_state):
+        '''Rebuilds a solution path from the layer files. Starting from the
+        goal in the last layer, we look for a neighbor in the layer before
+        it, then a neighbor of that one in the layer before that, and so on
+        back to the start. Returns a list of (parent_state, direction)
+        tuples, just like retrieve_solution_path.
+        '''
+        solution_path = []
+        child = goal_state
+        for layer_path in reversed(self.layer_files[:-1]):
+            for mv_dir, parent in self.get_neighbor_states(child):
+                if self.file_contains(layer_path, self.encode(parent)):
+                    solution_path.insert(0, (parent, self.reverse_dirs[mv_dir]))
+                    child = parent
+                    break
+        return solution_path
+
+    def clean_up(self, made_dir):
+        '''Deletes any runs left over from a layer we didn't finish, then 
+        the layer files, and the work_dir if we made it
+        '''
+        for name in os.listdir(self.work_dir):
+            if name.startswith("run_") and name.endswith(".bin"):
+                os.remove(os.path.join(self.work_dir, name))
+        if self.keep_files:
+            return
+        if made_dir:
+            shutil.rmtree(self.work_dir, ignore_errors = True)
+            self.work_dir = None
+        else:
+            for layer_path in self.layer_files:
+                os.remove(layer_path)
+        self.layer_files = []
+
+    def solve(self, verbose = False, time_bound = 180, check_every = 100,
+              max_expansions = None):
+        '''Breadth-first search one layer at a time, entirely through files:
+
+            * write the start board as layer 0
+            * build each new layer from the one before it by sorting and merging
+            * stop when the goal shows up in a layer, and trace the path back
+            * if a layer comes out empty, the board can't be solved
+
+        Boards that can't reach the goal are caught up front by 
+        is_solveable, rather than by searching their whole half of the 
+        state space first.
+
+        The time_bound argument will end any solver that has been running for
+        more than X seconds. Default value lets these spin for 3 minutes max.
+        Along with interrupts and the optional max_expansions budget, it's 
+        checked every check_every boards, even in the middle of a layer.
+        '''
+        if not self.is_solveable():
+            print("Initial board state not solveable")
+            return None
+        self.start_limits(time_bound, check_every, max_expansions)
+        made_dir = self.work_dir is None
+        if made_dir:
+            self.work_dir = tempfile.mkdtemp(prefix = "eight_block_")
+        goal_state = self.board_to_state(self.goal_state)
+        goal_code = self.encode(goal_state)
+        start_code = self.encode(self.board_to_state(self.board_state))
+        try:
+            layer_path = os.path.join(self.work_dir, "layer_0.bin")
+            self.write_codes(layer_path, [start_code])
+            self.layer_files = [layer_path]
+            found = start_code == goal_code
+            while not found:
+                depth = len(self.layer_files)
+                run_paths = self.write_sorted_runs(self.layer_files[-1], depth)
+                run_paths = self.reduce_runs(run_paths, depth)
+                previous_path = self.layer_files[-2] if depth > 1 else None
+                layer_path = os.path.join(self.work_dir, "layer_{}.bin".format(depth))
+                layer_size = self.write_codes(layer_path,
+                                              self.merge_runs(run_paths, previous_path))
+                for run_path in run_paths:
+                    os.remove(run_path)
+                self.layer_files.append(layer_path)
+                if verbose:
+                    print("Depth {} has {} states".format(depth, layer_size))
+                if not layer_size:
+                    print("Initial board state not solveable")
+                    return None
+                found = self.file_contains(layer_path, goal_code)
+            print("Solution found!")
+            self.board_state = self.goal_state
+            return self.trace_back(goal_state)
+        except searchStopped:
+            return None
+        finally:
+            self.clean_up(made_dir)
+
+if __name__ == "__main__":
+    pass
@@ -1,13 +1,15 @@
-import time
-import ipdb
 import math
 
 from base_solver import eightBlockSolver
+from search_engine import priorityFrontier
+from heuristic_cache import heuristicCache, get_shared_cache
 
 
 class baseHeuristicSolver(eightBlockSolver):
 
-    def __init__(self, heuristic, start_state = None, goal_state = None):
+    def __init__(self, heuristic, start_state = None, goal_state = None, 
+                 cache_size = 100000, cache_policy = "lru", share_cache = False,
+                 canonical_cache = False):
         '''
         This class only contains the methods for calculating any possible 
         heuristic that we might want to use. Each of these heuristic methods 
@@ -16,6 +18,15 @@ class baseHeuristicSolver(eightBlockSolver):
         The only rule for heuristics that I see right now is that they need
         to support a board = None default like get_misplaced_values() and
         get_row()
+
+        Heuristic values are memoized in `h_cache` (see heuristic_cache.py),
+        holding at most cache_size boards and evicting by cache_policy. With
+        share_cache = True, every solver with the same goal and heuristic 
+        uses the same cache, so repeated solves against one goal reuse it.
+        With canonical_cache = True, boards are cached by their canonical 
+        state from symmetry.py, so every symmetric copy of a board shares 
+        one entry. Every heuristic here only depends on how far tiles are 
+        from home, which those symmetries don't change.
         '''
         super().__init__(start_state, goal_state)
         self.h_dict = {"hamming": self.hamming_distance,
@@ -29,6 +40,16 @@ class baseHeuristicSolver(eightBlockSolver):
             raise NotImplementedError(e_msg)
         self.heuristic = heuristic
         self.calculate_heuristic = self.h_dict[self.heuristic]
+        self.canonicalizer = None
+        if canonical_cache:
+            from symmetry import symmetryCanonicalizer
+            self.canonicalizer = symmetryCanonicalizer(self.goal_state)
+        if share_cache:
+            goal_key = self.board_to_state(self.goal_state)
+            self.h_cache = get_shared_cache(goal_key, heuristic, cache_size, 
+                                            cache_policy, canonical_cache)
+        else:
+            self.h_cache = heuristicCache(cache_size, cache_policy)
         for child in self.children_list:
             self.add_heuristic_tag(child)
 
@@ -42,7 +63,12 @@ class baseHeuristicSolver(eightBlockSolver):
         '''
         if not isinstance(child, dict) or "child" not in child.keys():
             raise NotImplementedError
-        child["heuristic"] = self.calculate_heuristic(child["child"])
+        board = child["child"]
+        cache_key = child["state"]
+        if self.canonicalizer is not None:
+            cache_key = self.canonicalizer.canonical_key(cache_key)
+        child["heuristic"] = self.h_cache.get_or_compute(cache_key,
+            lambda: self.calculate_heuristic(board))
 
     def hamming_distance(self, board = None):
         '''Compares a given board state to the goal state and returns the
@@ -80,47 +106,21 @@ class baseHeuristicSolver(eightBlockSolver):
         '''
         pass
 
-    def tag_and_sort(self, list_of_children):
-        '''Given the output of self.get_children, this method will simply
-        add the heuristic tag to each item and then sort them so that the
-        one with the lowest heuristic value goes first
+    def make_frontier(self):
+        '''Every heuristic solver treats children_list as a priority queue,
+        ordered so that the child with the lowest get_priority value goes 
+        first
+        '''
+        return priorityFrontier(self.get_priority)
+
+    def get_children(self, current_board):
+        '''Gets the children of current_board just like any other solver,
+        but adds the heuristic tag to each one so that it can be ranked
         '''
+        list_of_children = super().get_children(current_board)
         for child in list_of_children:
             self.add_heuristic_tag(child)
-        return sorted(list_of_children, key = lambda v: self.get_priority(v))
-
-    def bst_insertion(self, child, lwr = None, upr = None):
-        '''Uses a binary search tree method to find the right place to 
-        insert child into self.list_of_children. Does so recursively and
-        will modify self.list_of_children in place
-
-        Ideally, this will help me implement a quicker method of ordering
-        the priority queue than relying solely on the scanning method above
-        '''
-        lwr = 0 if lwr is None else lwr
-        upr = len(self.children_list) if upr is None else upr
-        if (upr - lwr) <= 1:
-            comp_val = self.get_priority(self.children_list[lwr])
-            loc = lwr if self.get_priority(child) <= comp_val else upr
-            self.children_list.insert(loc, child)
-        else:
-            mid = int((lwr + upr)/2)
-            comp_val = self.get_priority(self.children_list[mid])
-            if self.get_priority(child) <= comp_val:
-                self.bst_insertion(child, lwr = lwr, upr = mid)
-            else:
-                self.bst_insertion(child, lwr = mid, upr = upr)
-
-    def bst_priority_queue(self, new_children):
-        '''Given a sorted list of candidate new children, this method will 
-        place them into the existing children_list using the binary search
-        driven method above
-        '''
-        if not self.children_list:
-            self.children_list.extend(new_children)
-            return
-        for child_dict in new_children:
-            self.bst_insertion(child_dict)
+        return list_of_children
 
 class bestFirstSearchSolver(baseHeuristicSolver):
 
@@ -131,44 +131,6 @@ class bestFirstSearchSolver(baseHeuristicSolver):
         '''
         return candidate_child["heuristic"]
 
-    def solve(self, verbose = False, time_bound = 180):
-        '''For best-first search, we're treating children_list as a priority 
-        queue, ordered by the lowest value of our heuristic (some form of 
-        distance from the goal state). In this method we...
-
-            * get the first item in children_list, exiting if it's empty
-            * update the path_map with info from that board
-            * check to see if we're at a goal state, returning the solution if we are
-            * Otherwise, we pop that top item off the priority queue
-            * Get that item's children, and use bst insertion to order those children
-            in the queue
-            * Repeat the entire process!
-
-        The time_bound argument will end any solver that has been running for
-        more than X seconds. Default value lets these spin for 3 minutes max.
-        '''
-        runtime = 0
-        while self.get_misplaced_values():
-            iter_start = time.time()
-            if runtime >= time_bound:
-                err_pt_1 = "Running for {} over seconds".format(time_bound)
-                err_pt_2 = "assuming unsolveable board."
-                print("...".join([err_pt_1, err_pt_2]))
-                return None
-            curr_board = self.check_next_child()
-            if curr_board is None:
-                return curr_board
-            self.update_path_map(curr_board)
-            if not self.get_misplaced_values():
-                print("Solution Found")
-                return self.retrieve_solution_path()
-            self.children_list.pop(0) 
-            ranked_kids = self.tag_and_sort(self.get_children(curr_board))
-            self.bst_priority_queue(ranked_kids)
-            if verbose and len(self.path_map) % 1000 == 0:
-                print("Checked {} states".format(len(self.path_map)))
-            runtime += time.time() - iter_start
-
 class aStarSearchSolver(baseHeuristicSolver):
 
     def get_priority(self, candidate_child):
@@ -178,45 +140,121 @@ class aStarSearchSolver(baseHeuristicSolver):
         '''
         return candidate_child["heuristic"] + candidate_child["path_cost"]
 
-    def solve(self, verbose = False, time_bound = 180):
-        '''For A Star search, we're treating children_list as a priority 
-        queue. But instead of being ordered only by distance from the goal
-        state, we're ordering by "distance from the goal state" plus
-        "current path cost" of that solution. The method otherwise proceeds
-        basically just like bestFirst search does.
-
-            * get the first item in children_list, exiting if it's empty
-            * update the path_map with info from that board
-            * check to see if we're at a goal state, returning the solution if we are
-            * Otherwise, we pop that top item off the priority queue
-            * Get that item's children, and use bst insertion to order those children
-            in the queue
+class beamSearchSolver(baseHeuristicSolver):
+
+    checkpoint_attrs = ["beam_width", "restarts", "beam_growth", "board_zero"]
+
+    def __init__(self, heuristic, start_state = None, goal_state = None, 
+                 beam_width = 100, restarts = 0, beam_growth = 2, **cache_options):
+        '''Beam search only ever holds one layer of the search tree at a 
+        time, and trims that layer down to the `beam_width` children with the 
+        lowest heuristic value before moving on. That keeps both memory and 
+        time per layer bounded, at the cost of completeness: the beam can 
+        throw away every path to the goal.
+
+        When that happens, we can optionally start over with a wider beam.
+
+            * beam_width: the number of boards kept at each depth
+            * restarts: how many times we'll retry after the beam runs dry
+            * beam_growth: what we multiply beam_width by on each restart
+
+        Any cache_options are passed along to baseHeuristicSolver.
+        '''
+        super().__init__(heuristic, start_state, goal_state, **cache_options)
+        if beam_width < 1:
+            raise ValueError("beam_width must be at least 1")
+        self.beam_width = beam_width
+        self.restarts = restarts
+        self.beam_growth = beam_growth
+        self.board_zero = self.children_list[0]
+
+    def get_priority(self, candidate_child):
+        '''Just like best first search, the beam is ranked on the 
+        heuristic value alone
+        '''
+        return candidate_child["heuristic"]
+
+    def make_frontier(self):
+        '''The beam is just a plain list holding the current layer'''
+        return []
+
+    def next_layer(self, layer, goal):
+        '''Expands every board in the current layer, adding each to the 
+        path_map as we go. Returns None along with the solution if any board 
+        in the layer is the goal state string, and None twice if over_limits
+        stopped us partway through. Otherwise returns the best beam_width 
+        children of the whole layer, skipping duplicates reached through 
+        more than one parent.
+        '''
+        candidates = {}
+        for curr_board in layer:
+            if self.over_limits():
+                return None, None
+            self.expansions += 1
+            self.update_path_map(curr_board)
+            if curr_board["state"] == goal:
+                return None, self.retrieve_solution_path()
+            for child in self.get_children(curr_board):
+                if child["state"] not in candidates:
+                    candidates[child["state"]] = child
+        ranked_kids = sorted(candidates.values(), key = self.get_priority)
+        return ranked_kids[:self.beam_width], None
+
+    def widen_and_restart(self, verbose = False):
+        '''If the beam empties out before reaching the goal, we clear the 
+        path_map, go back to the initial board, and widen the beam
+        '''
+        self.path_map.clear()
+        self.path_costs.clear()
+        self.load_frontier([self.board_zero])
+        self.board_state = self.board_zero["child"]
+        self.restarts -= 1
+        self.beam_width *= self.beam_growth
+        if verbose:
+            print("Restarting with beam width {}".format(self.beam_width))
+
+    def solve(self, verbose = False, time_bound = 180, check_every = 100,
+              max_expansions = None):
+        '''Runs run_beam with any checkpoint signal handlers installed'''
+        previous_handlers = self.install_signal_handlers()
+        try:
+            self.start_limits(time_bound, check_every, max_expansions)
+            return self.run_beam(verbose = verbose)
+        finally:
+            self.restore_signal_handlers(previous_handlers)
+
+    def run_beam(self, verbose = False):
+        '''For beam search, children_list holds the current layer of the 
+        search tree rather than a queue of everything generated so far. In 
+        this method we...
+
+            * expand every board in the layer, returning a solution if we find one
+            * keep only the beam_width best children as the next layer
+            * if the layer is ever empty, widen the beam and restart if we 
+            still have restarts left, or give up otherwise
             * Repeat the entire process!
 
-        The time_bound argument will end any solver that has been running for
-        more than X seconds. Default value lets these spin for 3 minutes max.
+        The limits passed to solve (time_bound, check_every and 
+        max_expansions) are checked by next_layer every check_every boards, 
+        so a wide beam can't run far past them in the middle of a layer.
         '''
-        runtime = 0
-        while self.get_misplaced_values():
-            iter_start = time.time()
-            if runtime >= time_bound:
-                err_pt_1 = "Running for {} over seconds".format(time_bound)
-                err_pt_2 = "assuming unsolveable board."
-                print("...".join([err_pt_1, err_pt_2]))
+        goal = self.board_to_state(self.goal_state)
+        while True:
+            if not self.children_list:
+                if self.restarts <= 0:
+                    print("Beam emptied out before reaching a solution")
+                    return None
+                self.widen_and_restart(verbose = verbose)
+                continue
+            layer, solution = self.next_layer(self.children_list, goal)
+            if solution is not None:
+                print("Solution found!")
+                return solution
+            if layer is None:
                 return None
-            curr_board = self.check_next_child()
-            if curr_board is None:
-                return curr_board
-            self.update_path_map(curr_board)
-            if not self.get_misplaced_values():
-                print("Solution Found")
-                return self.retrieve_solution_path()
-            self.children_list.pop(0) 
-            ranked_kids = self.tag_and_sort(self.get_children(curr_board))
-            self.bst_priority_queue(ranked_kids)
-            if verbose and len(self.path_map) % 1000 == 0:
+            self.children_list = layer
+            if verbose:
                 print("Checked {} states".format(len(self.path_map)))
-            runtime += time.time() - iter_start
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+
+'''This file contains a small bounded cache for heuristic values. The same 
+board gets generated over and over through different parents, and without 
+a cache every one of those arrivals recomputes its heuristic from scratch.
+
+Caches are keyed by board state string, so a single cache is only valid for
+one goal and one heuristic. Solvers with the same goal and heuristic can 
+share a cache through get_shared_cache. At most MAX_SHARED_CACHES of those 
+are kept around, so solving against many different goals can't pile up 
+caches forever.
+'''
+
+class heuristicCache():
+
+    def __init__(self, max_size = 100000, policy = "lru"):
+        '''Sets up an empty cache:
+
+            * max_size: the most entries we'll hold before evicting. None 
+            means no limit, and 0 turns the cache off entirely
+            * policy: which entry gets evicted once we're full. "lru" drops 
+            the least recently used entry, "fifo" drops the oldest one
+            * hits, misses: counters for how often lookups found a value
+        '''
+        if policy not in ["lru", "fifo"]:
+            p_tried = "Tried to use eviction policy {}.".format(policy)
+            raise NotImplementedError(" ".join([p_tried, "Must be one of lru, fifo."]))
+        self.max_size = max_size
+        self.policy = policy
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, state):
+        '''Returns the cached value for state, or None if it isn't cached'''
+        value = self.values.get(state)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.policy == "lru":
+                self.values.move_to_end(state)
+        return value
+
+    def put(self, state, value):
+        '''Stores value for state, evicting an entry first if we're full'''
+        if self.max_size == 0:
+            return
+        if self.max_size is not None and len(self.values) >= self.max_size:
+            self.values.popitem(last = False)
+        self.values[state] = value
+
+    def get_or_compute(self, state, calculate):
+        '''Returns the cached value for state, calling calculate() and 
+        caching its result on a miss
+        '''
+        value = self.get(state)
+        if value is None:
+            value = calculate()
+            self.put(state, value)
+        return value
+
+    def stats(self):
+        '''Returns a dictionary of hit and miss counts, the hit rate, and 
+        how many entries the cache currently holds
+        '''
+        lookups = self.hits + self.misses
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self.values)}
+
+    def clear(self):
+        '''Empties the cache and resets the counters'''
+        self.values.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+MAX_SHARED_CACHES = 8
+
+_shared_caches = OrderedDict()
+
+
+def get_shared_cache(goal_state, heuristic, max_size = 100000, policy = "lru",
+                     canonical = False):
+    '''Returns the cache shared by every solver with this goal state string
+    and heuristic name, creating it the first time it's asked for. Later 
+    callers get the existing cache, whatever size and policy they ask for.
+
+    Once more than MAX_SHARED_CACHES exist, the least recently asked for 
+    one is dropped. Solvers already holding it can keep using it, but new 
+    solvers will start a fresh cache instead.
+
+    Caches keyed by canonical state (see symmetry.py) are kept apart from 
+    ones keyed by plain state, since their keys mean different things.
+    '''
+    key = (goal_state, heuristic, canonical)
+    if key in _shared_caches:
+        _shared_caches.move_to_end(key)
+        return _shared_caches[key]
+    _shared_caches[key] = heuristicCache(max_size, policy)
+    while len(_shared_caches) > MAX_SHARED_CACHES:
+        _shared_caches.popitem(last = False)
+    return _shared_caches[key]
+
+
+def clear_shared_caches():
+    '''Forgets every shared cache'''
+    _shared_caches.clear()
+
+if __name__ == "__main__":
+    pass
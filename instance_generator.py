@@ -0,0 +1,103 @@
+import random
+
+from base_board import eightBlock
+
+'''This file contains a generator for benchmark boards. Shuffling 0-8 like
+get_default("start") does gives us unsolveable boards half of the time and no
+control at all over how hard the solveable ones are. 
+
+Instead, we run a single breadth-first search backwards from the goal over 
+the entire reachable state space (181,440 boards for any goal) and bucket 
+every board by its optimal solution length. After that, drawing a board at 
+an exact depth is just picking uniformly at random from the right bucket.
+'''
+
+class instanceGenerator(eightBlock):
+
+    def __init__(self, goal_state = None, seed = None):
+        '''Sets up the goal we're generating boards for, plus:
+
+            * rng: a random.Random seeded with `seed`, so the same seed and
+            goal always produce the same boards
+            * depth_table: dictionary mapping each optimal depth to a list 
+            of every board state at that depth. It's built the first time 
+            we need it, since the breadth-first search takes a moment.
+        '''
+        super().__init__(goal_state = goal_state)
+        self.board_state = self.goal_state
+        self.rng = random.Random(seed)
+        self.depth_table = None
+
+    def build_depth_table(self):
+        '''Breadth-first search outward from goal_state, one layer at a time.
+        Every move can be undone, so a board's depth in this search is also 
+        the length of its optimal solution.
+        '''
+        goal = self.board_to_state(self.goal_state)
+        seen = {goal}
+        layer = [goal]
+        self.depth_table = {}
+        depth = 0
+        while layer:
+            self.depth_table[depth] = layer
+            next_layer = []
+            for state in layer:
+                for _, child in self.get_neighbor_states(state):
+                    if child not in seen:
+                        seen.add(child)
+                        next_layer.append(child)
+            layer = next_layer
+            depth += 1
+        return self.depth_table
+
+    def get_depth_table(self):
+        '''Returns depth_table, building it first if we haven't already'''
+        if self.depth_table is None:
+            self.build_depth_table()
+        return self.depth_table
+
+    def count_at_depth(self, depth):
+        '''Returns how many solveable boards have an optimal solution of 
+        exactly `depth` moves
+        '''
+        return len(self.get_depth_table().get(depth, []))
+
+    def generate(self, n, depth = None, depth_weights = None, as_state = False):
+        '''Returns n solveable boards drawn at random. Exactly one of depth 
+        or depth_weights picks how hard they are:
+
+            * depth: an int for boards at exactly that optimal depth, or any
+            iterable of ints (like range(20, 25)) to spread the boards evenly
+            across those depths
+            * depth_weights: a dictionary of {depth: weight}, for choosing 
+            your own distribution over depths
+
+        Within a depth, every board is equally likely. Boards come back as 
+        lists, or as strings if as_state is True.
+        '''
+        if (depth is None) == (depth_weights is None):
+            raise ValueError("Pass exactly one of depth or depth_weights")
+        if depth_weights is None:
+            depths = [depth] if isinstance(depth, int) else list(depth)
+            depth_weights = {d: 1 for d in depths}
+        depth_table = self.get_depth_table()
+        for d in depth_weights.keys():
+            if d not in depth_table:
+                d_max = max(depth_table.keys())
+                raise ValueError("Depth must be between 0 and {}, not {}".format(d_max, d))
+        if len(depth_weights) == 1:
+            d = next(iter(depth_weights))
+            states = self.rng.choices(depth_table[d], k = n)
+        else:
+            depths = self.rng.choices(list(depth_weights.keys()), 
+                                      weights = list(depth_weights.values()), k = n)
+            states = []
+            for d in depth_weights.keys():
+                states.extend(self.rng.choices(depth_table[d], k = depths.count(d)))
+            self.rng.shuffle(states)
+        if as_state:
+            return states
+        return [self.state_to_board(s) for s in states]
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,108 @@
+from base_solver import eightBlockSolver
+from search_engine import queueFrontier, searchEngine
+
+'''This file contains a solver for questions with one shared endpoint and 
+lots of other endpoints, like "how do I get from this board to each of these
+twenty goals?" Rather than running twenty separate searches, we run one 
+breadth-first search out from the shared board and read every answer off the
+same path_map. Every move costs the same, so breadth-first search settles 
+boards in exactly the order Dijkstra's algorithm would.
+
+Answers come back in the same (parent_state, direction) form as 
+retrieve_solution_path, so display_solution_path works on them too.
+'''
+
+class multiTargetSolver(eightBlockSolver):
+
+    def make_frontier(self):
+        '''Breadth-first, so every board is settled at its optimal depth'''
+        return queueFrontier()
+
+    def search_from(self, source, targets, verbose = False, time_bound = 180,
+                    check_every = 100):
+        '''Breadth-first search out from the board `source`, stopping once 
+        every state string in `targets` is in the path_map. Returns the set 
+        of targets we didn't reach, which is only non-empty if we ran out of
+        time or the frontier emptied out.
+        '''
+        self.path_map.clear()
+        self.path_costs.clear()
+        self.board_state = source
+        self.load_frontier([{"child":source,
+                             "state":self.board_to_state(source),
+                             "parent":None,
+                             "path_cost":0}])
+        engine = searchEngine(self, check_every, targets = targets)
+        return engine.run(verbose = verbose, time_bound = time_bound)
+
+    def trace_path(self, child_key):
+        '''Follows the path_map back from child_key to the source of the 
+        last search, just like retrieve_solution_path does from board_state
+        '''
+        solution_path = []
+        while self.path_map.get(child_key, ""):
+            solution_path.insert(0, self.path_map[child_key])
+            child_key = self.path_map[child_key][0]
+        return solution_path
+
+    def trace_path_to_source(self, start_key):
+        '''Follows the path_map from start_key back to the source of the 
+        last search, turning each step around, so the result reads as a 
+        solution from start_key to the source
+        '''
+        solution_path = []
+        while self.path_map.get(start_key, ""):
+            parent_state, mv_dir = self.path_map[start_key]
+            solution_path.append((start_key, self.reverse_dirs[mv_dir]))
+            start_key = parent_state
+        return solution_path
+
+    def split_by_solveability(self, boards, shared_board):
+        '''Validates every board and returns a dictionary of their state 
+        strings, with None as the answer for any board that can't reach (or 
+        be reached from) shared_board. Moves preserve parity both ways, so
+        one check works for either direction.
+        '''
+        answers = {}
+        for board in boards:
+            state = self.board_to_state(self.validate(board))
+            if not self.is_solveable(board, shared_board):
+                answers[state] = None
+            else:
+                answers[state] = []
+        return answers
+
+    def solve_one_to_many(self, goal_states, verbose = False, time_bound = 180):
+        '''Finds an optimal solution from board_state to every board in 
+        goal_states with a single search. Returns a dictionary mapping each 
+        goal's state string to its solution path, or to None if that goal 
+        can't be reached (or wasn't reached before time ran out).
+        '''
+        answers = self.split_by_solveability(goal_states, self.board_state)
+        source = self.board_state
+        targets = [k for k, v in answers.items() if v is not None]
+        missed = self.search_from(source, targets, verbose, time_bound)
+        for state in targets:
+            answers[state] = None if state in missed else self.trace_path(state)
+        self.board_state = source
+        return answers
+
+    def solve_many_to_one(self, start_states, verbose = False, time_bound = 180):
+        '''Finds an optimal solution from every board in start_states to 
+        goal_state with a single search. Since every move can be undone, we
+        search outward from the goal and then read each path backwards. 
+        Returns a dictionary mapping each start's state string to its 
+        solution path, or to None if that start can't reach the goal (or 
+        wasn't reached before time ran out).
+        '''
+        answers = self.split_by_solveability(start_states, self.goal_state)
+        source = self.board_state
+        targets = [k for k, v in answers.items() if v is not None]
+        missed = self.search_from(self.goal_state, targets, verbose, time_bound)
+        for state in targets:
+            answers[state] = None if state in missed else self.trace_path_to_source(state)
+        self.board_state = source
+        return answers
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,186 @@
+import heapq
+import time
+from collections import deque
+from itertools import count
+
+'''This file contains the one search loop that every solver runs, along with
+the frontier strategies that make the solvers different from each other. A 
+frontier decides which board gets expanded next: a stack gives depth-first 
+search, a queue gives breadth-first search, and so on.
+
+The loop itself is kept as small as possible, since it runs once per board:
+the goal check is a single set lookup on the state string, and the time 
+limit, expansion budget, and progress messages are only looked at every so 
+often.
+'''
+
+class searchFrontier():
+    '''Every frontier holds board dictionaries like the ones described in 
+    base_solver.py and supports:
+
+        * extend(nodes): adds a list of boards, so that (ties aside) the 
+        first board in the list is the first one to come back out
+        * pop(): removes and returns the next board, or None if it's empty
+        * iterating over it, which yields boards in the order pop() would
+        return them, without removing anything
+    '''
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+class stackFrontier(searchFrontier):
+
+    def __init__(self):
+        '''Last in, first out. Children are pushed in reverse so that the 
+        first direction we could move is always the next one we try.
+        '''
+        self.nodes = []
+
+    def __iter__(self):
+        return reversed(self.nodes)
+
+    def extend(self, nodes):
+        self.nodes.extend(reversed(nodes))
+
+    def pop(self):
+        return self.nodes.pop() if self.nodes else None
+
+class depthBoundedFrontier(stackFrontier):
+
+    def __init__(self, depth_limit, cutoff = False):
+        '''A stack that refuses any board deeper than depth_limit. The 
+        `cutoff` flag remembers whether anything was refused, which tells 
+        iterative deepening whether there's any point in going deeper. It 
+        can start out True when we're rebuilding a frontier from a 
+        checkpoint taken after something had already been refused.
+        '''
+        super().__init__()
+        self.depth_limit = depth_limit
+        self.cutoff = cutoff
+
+    def extend(self, nodes):
+        for node in reversed(nodes):
+            if node["path_cost"] > self.depth_limit:
+                self.cutoff = True
+            else:
+                self.nodes.append(node)
+
+class queueFrontier(searchFrontier):
+
+    def __init__(self):
+        '''First in, first out'''
+        self.nodes = deque()
+
+    def extend(self, nodes):
+        self.nodes.extend(nodes)
+
+    def pop(self):
+        return self.nodes.popleft() if self.nodes else None
+
+class priorityFrontier(searchFrontier):
+
+    def __init__(self, get_priority):
+        '''A binary heap ordered by get_priority(board), lowest first. Among 
+        boards with equal priority, the most recently added comes out first.
+        '''
+        self.get_priority = get_priority
+        self.nodes = []
+        self.counter = count()
+
+    def __iter__(self):
+        return (node for _, _, node in sorted(self.nodes))
+
+    def extend(self, nodes):
+        for node in nodes:
+            entry = (self.get_priority(node), -next(self.counter), node)
+            heapq.heappush(self.nodes, entry)
+
+    def pop(self):
+        return heapq.heappop(self.nodes)[2] if self.nodes else None
+
+
+class searchEngine():
+
+    def __init__(self, solver, check_every = 100, max_expansions = None,
+                 targets = None):
+        '''Runs a search for `solver`, which supplies the frontier (its 
+        children_list), the path_map, and the get_children method used to 
+        expand boards.
+
+            * check_every: how many boards we pop between checks of the time
+            limit, interrupts, and the expansion budget
+            * max_expansions: stop after expanding this many boards. None 
+            means no limit
+            * targets: the goal test, as a collection of state strings. The
+            search stops once every one of them has been reached. None means
+            just the solver's goal_state
+        '''
+        self.solver = solver
+        self.check_every = check_every
+        self.max_expansions = max_expansions
+        if targets is None:
+            targets = [solver.board_to_state(solver.goal_state)]
+        self.targets = targets
+
+    def run(self, verbose = False, time_bound = 180):
+        '''The loop every solver shares:
+
+            * pop the next board off the frontier
+            * skip it if we've already expanded that state at the same or lower cost
+            * record it in the path_map, and stop if it was the last target left
+            * otherwise, expand it and hand its children to the frontier
+
+        If the frontier runs dry, the solver gets one chance to restart the 
+        search (iterative deepening does), otherwise the board isn't 
+        solveable. Returns the set of targets we didn't reach, so an empty 
+        set means every path can now be read off the path_map.
+        '''
+        solver = self.solver
+        unsettled = set(self.targets)
+        if not unsettled:
+            return unsettled
+        frontier = solver.children_list
+        path_map = solver.path_map
+        path_costs = solver.path_costs
+        get_children = solver.get_children
+        expansions = 0
+        until_check = 1
+        start = time.time()
+        while True:
+            until_check -= 1
+            if not until_check:
+                until_check = self.check_every
+                if solver.out_of_time(time.time() - start, time_bound):
+                    return unsettled
+                if self.max_expansions is not None and expansions >= self.max_expansions:
+                    solver.stop_early("Expanded {} states".format(expansions))
+                    return unsettled
+            node = frontier.pop()
+            if node is None:
+                if solver.restart_search(verbose = verbose):
+                    frontier = solver.children_list
+                    continue
+                print("Initial board state not solveable")
+                return unsettled
+            state = node["state"]
+            cost = node["path_cost"]
+            if path_costs.get(state, cost + 1) <= cost:
+                continue
+            solver.board_state = node["child"]
+            path_costs[state] = cost
+            parent = node["parent"]
+            path_map[state] = parent if parent is None else (parent, node["mv_dir"])
+            if state in unsettled:
+                unsettled.discard(state)
+                if not unsettled:
+                    return unsettled
+            frontier.extend(get_children(node))
+            expansions += 1
+            if verbose and not expansions % 1000:
+                print("Checked {} states".format(len(path_map)))
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,84 @@
+import importlib
+
+'''This file lets you look up any solver by a short name, like "bfs" or 
+"astar", without importing every solver module up front. Nothing heavier 
+than importlib is loaded when this module is imported; each solver module is
+only imported the first time one of its solvers is asked for. 
+
+That keeps cold start cheap for processes that only ever need one algorithm.
+'''
+
+# name: (module, class name, whether the solver needs a heuristic)
+SOLVERS = {"dfs": ("non_heuristic", "depthFirstSearchSolver", False),
+           "bfs": ("non_heuristic", "breadthFirstSearchSolver", False),
+           "ids": ("non_heuristic", "iterativeDeepeningSolver", False),
+           "external_bfs": ("external_bfs", "externalMemoryBFSSolver", False),
+           "greedy": ("heuristic", "bestFirstSearchSolver", True),
+           "astar": ("heuristic", "aStarSearchSolver", True),
+           "beam": ("heuristic", "beamSearchSolver", True)}
+
+_loaded_classes = {}
+
+
+def register_solver(name, module_name, class_name, uses_heuristic = False):
+    '''Adds a solver to the registry. The module isn't imported until the 
+    solver is actually requested
+    '''
+    SOLVERS[name] = (module_name, class_name, uses_heuristic)
+    _loaded_classes.pop(name, None)
+
+
+def available_solvers():
+    '''Returns the names of every registered solver'''
+    return sorted(SOLVERS.keys())
+
+
+def parse_solver_name(name):
+    '''Solver names can carry their heuristic after a colon, so that 
+    "astar:manhattan" is the same as asking for "astar" with heuristic 
+    "manhattan". Returns a (name, heuristic) tuple, where heuristic is None
+    if there wasn't one.
+    '''
+    name, _, heuristic = name.partition(":")
+    return name, heuristic or None
+
+
+def get_solver_class(name):
+    '''Returns the class registered under name, importing its module the 
+    first time it's needed
+    '''
+    if name not in SOLVERS:
+        s_tried = "Tried to use solver {}.".format(name)
+        s_valid = "Must be one of {}.".format(", ".join(available_solvers()))
+        raise NotImplementedError(" ".join([s_tried, s_valid]))
+    if name not in _loaded_classes:
+        module_name, class_name, _ = SOLVERS[name]
+        module = importlib.import_module(module_name)
+        _loaded_classes[name] = getattr(module, class_name)
+    return _loaded_classes[name]
+
+
+def make_solver(name, start_state = None, goal_state = None, heuristic = None, 
+                **kwargs):
+    '''Builds a solver by name. For solvers that need one, the heuristic can
+    be passed either as an argument or after a colon in the name, like 
+    make_solver("astar:manhattan", start, goal). Any other keyword arguments
+    (beam_width, for instance) are handed straight to the solver.
+    '''
+    name, name_heuristic = parse_solver_name(name)
+    if name_heuristic is not None:
+        if heuristic is not None and heuristic != name_heuristic:
+            e_msg = "Got two different heuristics: {} and {}"
+            raise ValueError(e_msg.format(name_heuristic, heuristic))
+        heuristic = name_heuristic
+    solver_class = get_solver_class(name)
+    if SOLVERS[name][2]:
+        if heuristic is None:
+            raise ValueError("Solver {} needs a heuristic".format(name))
+        return solver_class(heuristic, start_state, goal_state, **kwargs)
+    if heuristic is not None:
+        raise ValueError("Solver {} doesn't use a heuristic".format(name))
+    return solver_class(start_state, goal_state, **kwargs)
+
+if __name__ == "__main__":
+    pass
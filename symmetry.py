@@ -0,0 +1,162 @@
+from base_board import eightBlock
+
+'''This file contains a canonicalization layer that lets caches and tables 
+store one entry for a whole family of equivalent boards.
+
+The 3 x 3 grid has eight symmetries (four rotations and four reflections). 
+On their own they rarely map a goal onto itself, but if we also relabel the
+tiles, so that each tile is renamed after wherever its goal square gets 
+moved to, then the goal always maps onto itself. The only catch is that the 
+blank has to stay the blank, so we can only use the symmetries that leave 
+the blank's goal square where it is:
+
+    * blank in the centre (like [1,2,3,8,0,4,7,6,5]): all eight
+    * blank in a corner (like [1,2,3,4,5,6,7,8,0]): two, the identity and 
+    the reflection along that corner's diagonal
+    * blank on an edge: two, the identity and the reflection through that 
+    edge's middle
+
+Each usable symmetry maps legal moves to legal moves and the goal to itself,
+so two boards related by one have the same distance to the goal, the same 
+heuristic values, and solutions that map onto each other move for move.
+'''
+
+class symmetryCanonicalizer(eightBlock):
+
+    def __init__(self, goal_state = None):
+        '''Works out every symmetry we can use for goal_state:
+
+            * transforms: a list of (positions, relabel, dir_map) tuples. A 
+            tile at index i moves to index positions[i] and gets renamed 
+            relabel[tile], and a move in direction d becomes a move in 
+            direction dir_map[d]. The identity always comes first.
+            * inverses: the index in transforms that undoes each transform
+        '''
+        super().__init__(goal_state = goal_state)
+        self.board_state = self.goal_state
+        goal = self.board_to_state(self.goal_state)
+        blank_home = goal.index("0")
+        self.transforms = []
+        for positions in self.get_grid_symmetries():
+            if positions[blank_home] != blank_home:
+                continue
+            relabel = {v: goal[positions[goal.index(v)]] for v in goal}
+            dir_map = {}
+            for z_ind in range(9):
+                for mv_dir, swap_ind in self.move_table[z_ind]:
+                    for new_dir, new_swap in self.move_table[positions[z_ind]]:
+                        if new_swap == positions[swap_ind]:
+                            dir_map[mv_dir] = new_dir
+            self.transforms.append((positions, relabel, dir_map))
+        self.inverses = []
+        for positions, _, _ in self.transforms:
+            undo = [positions.index(i) for i in range(9)]
+            self.inverses.append([t[0] for t in self.transforms].index(undo))
+
+    def get_grid_symmetries(self):
+        '''Returns the eight rotations and reflections of the 3 x 3 grid, 
+        each as a list saying which index every index is sent to. The 
+        identity comes first.
+        '''
+        maps = [lambda r, c: (r, c), lambda r, c: (c, 2 - r),
+                lambda r, c: (2 - r, 2 - c), lambda r, c: (2 - c, r),
+                lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c),
+                lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r)]
+        symmetries = []
+        for sym in maps:
+            moved = [sym(*divmod(i, 3)) for i in range(9)]
+            symmetries.append([3 * r + c for r, c in moved])
+        return symmetries
+
+    def transform_state(self, state, transform):
+        '''Applies the transform at index `transform` to a state string'''
+        positions, relabel, _ = self.transforms[transform]
+        out = [""] * 9
+        for i, v in enumerate(state):
+            out[positions[i]] = relabel[v]
+        return "".join(out)
+
+    def canonicalize(self, state):
+        '''Returns (canonical_state, transform): the smallest state string 
+        any usable symmetry maps `state` onto, and the index of the transform
+        that gets it there
+        '''
+        best, best_t = state, 0
+        for t in range(1, len(self.transforms)):
+            candidate = self.transform_state(state, t)
+            if candidate < best:
+                best, best_t = candidate, t
+        return best, best_t
+
+    def canonical_key(self, state):
+        '''Just the canonical state, for use as a cache or table key'''
+        return self.canonicalize(state)[0]
+
+    def transform_path(self, solution_path, transform):
+        '''Maps a solution path of (parent_state, direction) tuples through a
+        transform, relabelling both the states and the directions
+        '''
+        dir_map = self.transforms[transform][2]
+        return [(self.transform_state(parent, transform), dir_map[mv_dir])
+                for parent, mv_dir in solution_path]
+
+    def restore_path(self, solution_path, transform):
+        '''Undoes canonicalize for a solution path: given a path from the 
+        canonical state that `transform` produced, returns the matching path
+        from the original state
+        '''
+        return self.transform_path(solution_path, self.inverses[transform])
+
+    def build_distance_table(self):
+        '''Breadth-first search out from the goal, but only over canonical 
+        states. Returns a dictionary mapping every canonical state to its 
+        optimal solution length; look a board up with canonical_key. With 
+        the blank in the centre, this is about an eighth the size of a table
+        over every board.
+        '''
+        goal = self.canonical_key(self.board_to_state(self.goal_state))
+        distance_table = {goal: 0}
+        layer = [goal]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for state in layer:
+                for _, child in self.get_neighbor_states(state):
+                    child = self.canonical_key(child)
+                    if child not in distance_table:
+                        distance_table[child] = depth
+                        next_layer.append(child)
+            layer = next_layer
+        return distance_table
+
+class canonicalSolutionCache():
+
+    def __init__(self, canonicalizer):
+        '''Stores solution paths for one goal, one entry per family of 
+        equivalent start boards, using the symmetryCanonicalizer built for 
+        that goal
+        '''
+        self.canonicalizer = canonicalizer
+        self.solutions = {}
+
+    def __len__(self):
+        return len(self.solutions)
+
+    def store(self, start_state, solution_path):
+        '''Saves solution_path (from start_state) in canonical form'''
+        canonical, transform = self.canonicalizer.canonicalize(start_state)
+        canonical_path = self.canonicalizer.transform_path(solution_path, transform)
+        self.solutions[canonical] = canonical_path
+
+    def lookup(self, start_state):
+        '''Returns a solution path from start_state if we've stored one for
+        any board equivalent to it, or None otherwise
+        '''
+        canonical, transform = self.canonicalizer.canonicalize(start_state)
+        if canonical not in self.solutions:
+            return None
+        return self.canonicalizer.restore_path(self.solutions[canonical], transform)
+
+if __name__ == "__main__":
+    pass
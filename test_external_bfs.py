@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from external_bfs import externalMemoryBFSSolver
+from instance_generator import instanceGenerator
+from test_solvers import GOAL, UNSOLVEABLE, replay
+
+'''Tests for the external-memory breadth-first search, kept out of 
+external_bfs.py for the same reason as test_solvers.py
+'''
+
+
+class countingBFSSolver(externalMemoryBFSSolver):
+
+    def write_sorted_runs(self, layer_path, depth):
+        '''Records the most runs any single layer needed'''
+        run_paths = super().write_sorted_runs(layer_path, depth)
+        self.most_runs = max(getattr(self, "most_runs", 0), len(run_paths))
+        return run_paths
+
+    def reduce_runs(self, run_paths, depth):
+        '''Records the most runs left for the last merge pass'''
+        run_paths = super().reduce_runs(run_paths, depth)
+        self.most_final_runs = max(getattr(self, "most_final_runs", 0), len(run_paths))
+        return run_paths
+
+
+class TestExternalMemoryBFS(unittest.TestCase):
+
+    def setUp(self):
+        self.gen = instanceGenerator(GOAL, seed = 11)
+
+    def test_path_length_matches_depth(self):
+        for depth in [0, 1, 9, 18]:
+            for board in self.gen.generate(2, depth = depth):
+                path = externalMemoryBFSSolver(board, GOAL).solve()
+                self.assertEqual(len(path), depth)
+                self.assertEqual(replay(board, path), GOAL)
+
+    def test_multiple_runs_per_layer(self):
+        board = self.gen.generate(1, depth = 20)[0]
+        solver = countingBFSSolver(board, GOAL, run_size = 50)
+        path = solver.solve()
+        self.assertGreater(solver.most_runs, 1)
+        self.assertEqual(len(path), 20)
+        self.assertEqual(replay(board, path), GOAL)
+
+    def test_bounded_fan_in(self):
+        board = self.gen.generate(1, depth = 20)[0]
+        with tempfile.TemporaryDirectory() as tmp:
+            solver = countingBFSSolver(board, GOAL, work_dir = tmp, run_size = 20,
+                                       merge_fan_in = 3)
+            path = solver.solve()
+            self.assertGreater(solver.most_runs, 9)
+            self.assertLessEqual(solver.most_final_runs, 3)
+            self.assertEqual(os.listdir(tmp), [])
+        self.assertEqual(len(path), 20)
+        self.assertEqual(replay(board, path), GOAL)
+
+    def test_unsolveable(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            solver = externalMemoryBFSSolver(UNSOLVEABLE, GOAL, work_dir = tmp)
+            self.assertIsNone(solver.solve())
+            self.assertEqual(solver.layer_files, [])
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_stops_mid_layer(self):
+        board = self.gen.generate(1, depth = 20)[0]
+        with tempfile.TemporaryDirectory() as tmp:
+            solver = externalMemoryBFSSolver(board, GOAL, work_dir = tmp, run_size = 50)
+            self.assertIsNone(solver.solve(check_every = 10, max_expansions = 500))
+            self.assertEqual(solver.expansions, 500)
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_files_cleaned_up(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            board = self.gen.generate(1, depth = 6)[0]
+            externalMemoryBFSSolver(board, GOAL, work_dir = tmp).solve()
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_no_checkpoints(self):
+        solver = externalMemoryBFSSolver(GOAL, GOAL)
+        with self.assertRaises(NotImplementedError):
+            solver.enable_checkpointing("search.json.gz")
+        with self.assertRaises(NotImplementedError):
+            solver.load_checkpoint("search.json.gz")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+import os
+import tempfile
+import unittest
+
+from base_board import eightBlock
+import heuristic_cache
+from heuristic import aStarSearchSolver, beamSearchSolver
+from heuristic_cache import heuristicCache, get_shared_cache, clear_shared_caches
+from instance_generator import instanceGenerator
+from multi_target import multiTargetSolver
+from non_heuristic import depthFirstSearchSolver, breadthFirstSearchSolver, \
+iterativeDeepeningSolver
+from solver_registry import SOLVERS, make_solver
+from symmetry import symmetryCanonicalizer, canonicalSolutionCache
+
+'''Regression tests for the solvers. These live in their own file rather 
+than inline like the ones in binary_search_insert.py, since importing 
+unittest would otherwise slow down every import of the solver modules.
+'''
+
+GOAL = [1,2,3,8,0,4,7,6,5]
+UNSOLVEABLE = [3,2,1,8,0,4,7,6,5]
+CORNER_GOAL = [1,2,3,4,5,6,7,8,0]
+
+
+def replay(start, solution_path):
+    '''Plays solution_path from start, checking that every step starts 
+    from the state it says it does. Returns the board we end up on.
+    '''
+    board = eightBlock(start, GOAL)
+    for parent_state, mv_dir in solution_path:
+        if board.board_to_state(board.board_state) != parent_state:
+            raise AssertionError("Path went through {}".format(parent_state))
+        board.board_state = board.make_move(mv_dir)
+        if not board.board_state:
+            raise AssertionError("Invalid move {}".format(mv_dir))
+    return board.board_state
+
+
+class TestSolutionLengths(unittest.TestCase):
+
+    def setUp(self):
+        self.gen = instanceGenerator(GOAL, seed = 7)
+
+    def test_bfs_is_optimal(self):
+        for depth in [0, 3, 12, 20]:
+            for board in self.gen.generate(3, depth = depth):
+                path = breadthFirstSearchSolver(board, GOAL).solve()
+                self.assertEqual(len(path), depth)
+                self.assertEqual(replay(board, path), GOAL)
+
+    def test_astar_is_optimal(self):
+        depth_table = self.gen.get_depth_table()
+        for heuristic in ["hamming", "manhattan", "euclidean"]:
+            for board in self.gen.generate(3, depth = range(8, 19)):
+                path = aStarSearchSolver(heuristic, board, GOAL).solve()
+                self.assertIn(self.gen.board_to_state(board), depth_table[len(path)])
+                self.assertEqual(replay(board, path), GOAL)
+
+    def test_dfs_finds_valid_path(self):
+        for board in self.gen.generate(2, depth = range(4, 9)):
+            path = depthFirstSearchSolver(board, GOAL).solve()
+            self.assertEqual(replay(board, path), GOAL)
+
+    def test_ids_finds_valid_path(self):
+        for board in self.gen.generate(3, depth = range(4, 11)):
+            path = iterativeDeepeningSolver(board, GOAL).solve()
+            self.assertEqual(replay(board, path), GOAL)
+
+    def test_unsolveable(self):
+        self.assertIsNone(breadthFirstSearchSolver(UNSOLVEABLE, GOAL).solve())
+        self.assertIsNone(aStarSearchSolver("manhattan", UNSOLVEABLE, GOAL).solve())
+
+
+class widthRecordingBeamSolver(beamSearchSolver):
+
+    def widen_and_restart(self, verbose = False):
+        '''Records the beam width after every restart'''
+        super().widen_and_restart(verbose = verbose)
+        self.widths.append(self.beam_width)
+
+
+class TestBeamSearch(unittest.TestCase):
+
+    def test_finds_valid_path(self):
+        gen = instanceGenerator(GOAL, seed = 5)
+        for board in gen.generate(3, depth = range(8, 19)):
+            path = beamSearchSolver("manhattan", board, GOAL).solve()
+            self.assertEqual(replay(board, path), GOAL)
+
+    def test_widens_then_gives_up(self):
+        solver = widthRecordingBeamSolver("manhattan", UNSOLVEABLE, GOAL,
+                                          beam_width = 1, restarts = 3, beam_growth = 3)
+        solver.widths = [solver.beam_width]
+        self.assertIsNone(solver.solve())
+        self.assertEqual(solver.widths, [1, 3, 9, 27])
+        self.assertEqual(solver.restarts, 0)
+
+
+class TestExpansionLimits(unittest.TestCase):
+
+    def test_every_solver_stops_at_max_expansions(self):
+        board = instanceGenerator(GOAL, seed = 6).generate(1, depth = 16)[0]
+        for name in SOLVERS:
+            heuristic = "manhattan" if SOLVERS[name][2] else None
+            solver = make_solver(name, board, GOAL, heuristic = heuristic)
+            self.assertIsNone(solver.solve(check_every = 1, max_expansions = 5), name)
+
+
+class TestHeuristicCache(unittest.TestCase):
+
+    def fill(self, policy):
+        '''Fills a two entry cache, reads the oldest entry, then adds a third'''
+        cache = heuristicCache(2, policy)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        return cache
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = self.fill("lru")
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_fifo_evicts_oldest(self):
+        cache = self.fill("fifo")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_size_zero_and_unbounded(self):
+        off = heuristicCache(0)
+        self.assertEqual(off.get_or_compute("a", lambda: 1), 1)
+        self.assertEqual(len(off), 0)
+        unbounded = heuristicCache(None)
+        for i in range(1000):
+            unbounded.put(str(i), i)
+        self.assertEqual(len(unbounded), 1000)
+
+    def test_hit_and_miss_counts(self):
+        cache = heuristicCache(10)
+        calls = []
+        for state in ["a", "b", "a", "a"]:
+            cache.get_or_compute(state, lambda: calls.append(state) or 1)
+        self.assertEqual(calls, ["a", "b"])
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 2, "hit_rate": 0.5, "size": 2})
+        cache.clear()
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    def test_shared_registry_is_capped(self):
+        clear_shared_caches()
+        try:
+            first = get_shared_cache("goal0", "manhattan")
+            for i in range(1, heuristic_cache.MAX_SHARED_CACHES):
+                get_shared_cache("goal{}".format(i), "manhattan")
+            self.assertIs(get_shared_cache("goal0", "manhattan"), first)
+            get_shared_cache("one_too_many", "manhattan")
+            registry = heuristic_cache._shared_caches
+            self.assertEqual(len(registry), heuristic_cache.MAX_SHARED_CACHES)
+            self.assertNotIn(("goal1", "manhattan", False), registry)
+            self.assertIs(get_shared_cache("goal0", "manhattan"), first)
+        finally:
+            clear_shared_caches()
+
+
+class TestSymmetry(unittest.TestCase):
+
+    def test_distance_table_matches_depth_table(self):
+        for goal, n_transforms in [(GOAL, 8), (CORNER_GOAL, 2)]:
+            canonicalizer = symmetryCanonicalizer(goal)
+            self.assertEqual(len(canonicalizer.transforms), n_transforms)
+            distance_table = canonicalizer.build_distance_table()
+            depth_table = instanceGenerator(goal).get_depth_table()
+            for depth, states in depth_table.items():
+                for state in states:
+                    self.assertEqual(distance_table[canonicalizer.canonical_key(state)], depth)
+
+    def test_cached_path_replays_for_symmetric_board(self):
+        for goal in [GOAL, CORNER_GOAL]:
+            canonicalizer = symmetryCanonicalizer(goal)
+            cache = canonicalSolutionCache(canonicalizer)
+            board = instanceGenerator(goal, seed = 8).generate(1, depth = 12)[0]
+            cache.store(canonicalizer.board_to_state(board),
+                        breadthFirstSearchSolver(board, goal).solve())
+            for t in range(len(canonicalizer.transforms)):
+                state = canonicalizer.transform_state(canonicalizer.board_to_state(board), t)
+                path = cache.lookup(state)
+                self.assertEqual(len(path), 12)
+                self.assertEqual(replay([int(v) for v in state], path), goal)
+
+    def test_canonical_cache_astar_is_optimal(self):
+        gen = instanceGenerator(GOAL, seed = 9)
+        depth_table = gen.get_depth_table()
+        for board in gen.generate(4, depth = range(8, 19)):
+            path = aStarSearchSolver("manhattan", board, GOAL, canonical_cache = True).solve()
+            self.assertIn(gen.board_to_state(board), depth_table[len(path)])
+            self.assertEqual(replay(board, path), GOAL)
+
+
+class TestMultiTarget(unittest.TestCase):
+
+    def check_answers(self, answers, boards, depths, source, to_source):
+        '''Checks each answer is as long as its board's depth and replays 
+        in the right direction: from source to the board, or from the board
+        back to source when to_source is set
+        '''
+        self.assertEqual(len(answers), len(boards) + 1)
+        for board, depth in zip(boards, depths):
+            path = answers[multiTargetSolver().board_to_state(board)]
+            self.assertEqual(len(path), depth)
+            if to_source:
+                self.assertEqual(replay(board, path), source)
+            else:
+                self.assertEqual(replay(source, path), board)
+
+    def draw(self, gen):
+        '''Draws boards at a spread of known depths from gen's goal'''
+        depths = [0, 1, 5, 11, 17, 22]
+        boards = [gen.generate(1, depth = d)[0] for d in depths]
+        return boards, depths
+
+    def test_one_to_many(self):
+        start = instanceGenerator(GOAL, seed = 12).generate(1, depth = 10)[0]
+        goals, depths = self.draw(instanceGenerator(start, seed = 13))
+        answers = multiTargetSolver(start, GOAL).solve_one_to_many(goals + [UNSOLVEABLE])
+        self.assertIsNone(answers[multiTargetSolver().board_to_state(UNSOLVEABLE)])
+        self.check_answers(answers, goals, depths, start, to_source = False)
+
+    def test_many_to_one(self):
+        starts, depths = self.draw(instanceGenerator(GOAL, seed = 14))
+        answers = multiTargetSolver(GOAL, GOAL).solve_many_to_one(starts + [UNSOLVEABLE])
+        self.assertIsNone(answers[multiTargetSolver().board_to_state(UNSOLVEABLE)])
+        self.check_answers(answers, starts, depths, GOAL, to_source = True)
+
+    def test_no_targets(self):
+        solver = multiTargetSolver(GOAL, GOAL)
+        self.assertEqual(solver.solve_one_to_many([]), {})
+        self.assertEqual(solver.solve_many_to_one([]), {})
+
+
+class TestIterativeDeepeningCheckpoint(unittest.TestCase):
+
+    def test_resume_after_cutoff(self):
+        gen = instanceGenerator(GOAL, seed = 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            ck_path = os.path.join(tmp, "ids.json.gz")
+            for board in gen.generate(10, depth = range(4, 9)):
+                first = iterativeDeepeningSolver(board, GOAL)
+                first.enable_checkpointing(ck_path)
+                self.assertIsNone(first.solve(max_expansions = 1, check_every = 1))
+                resumed = iterativeDeepeningSolver()
+                resumed.load_checkpoint(ck_path)
+                self.assertTrue(resumed.cutoff)
+                self.assertIsNotNone(resumed.solve())
+
+if __name__ == "__main__":
+    unittest.main()